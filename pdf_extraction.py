@@ -0,0 +1,552 @@
+"""Text extraction and field parsing for BPH/OVH PDFs
+
+Kept out of the Streamlit script so worker processes can pickle process_one_pdf by
+reference: Streamlit swaps in a new __main__ module on every script run.
+"""
+import re
+import io
+import logging
+from functools import lru_cache
+import pdfplumber
+import pandas as pd
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Precompiled extraction patterns (compiled once at import instead of per PDF).
+# Keyword patterns are written in lower case and run against text.lower() instead of
+# using re.IGNORECASE: case-insensitive patterns lose the engine's fast literal-prefix
+# scan, which makes them an order of magnitude slower on long texts. Captures whose
+# case matters are sliced from the original text by span.
+_BPH_PATTERNS = {
+    'claim': re.compile(r'reclamation\s+id\s*[\|:]?\s*(\d+)'),
+    'claim_report': re.compile(r'reclamation\s+details\s+report\s+with\s+reclamation\s+id\s*=\s*(\d+)'),
+    'style': re.compile(r'style\s+no\s*[\|:]?\s*(\d+)'),
+    'style_item': re.compile(r'style\s+no\s+item\s+no[^\d]*(\d+)\s+(\d+)'),
+    'item': re.compile(r'item\s+no\s*[\|:]?\s*(\d+)'),
+    'quantity': re.compile(r'delivered\s+quantity\s*[\|:]?\s*(\d+)'),
+    'quantity_office': re.compile(r'delivered\s+quantity\s+office[^\d]*(\d+)'),
+    'dept': re.compile(r'dept\./subdept\.\s*[\|:]?\s*([\d\.]+)'),
+    'dept_order': re.compile(r'dept\./subdept\.\s+order\s+no[^\d]*([\d\.]+)\s+(\d+)'),
+    'order': re.compile(r'order\s+no\s*[\|:]?\s*(\d+)'),
+    'decision_table': re.compile(r'decided by\s+date of decision\s+decision'),
+    'date_of_decision': re.compile(r'date of decision\s+(\d+/\d+/\d+)'),
+    # The comment runs from the line after "Comment for market" to the first of these
+    # section headings (or the end of the text); found with one search, then sliced
+    'comment_end': re.compile(r'samples|rework\s+details|reclamation\s+details\s+report|printed\s+on'),
+    # Case-sensitive: the only entry run against the original text instead of text.lower()
+    'sample_faulty': re.compile(r'Random\s+sample\s*Faulty\s+pieces\s*(\d+)\s*(\d+)'),
+}
+
+# The single-space spelling is tried first so it wins over an earlier multi-space one.
+# (Variants ending in \s+Dept were dropped: any text they match, these match too.)
+_SUPPLIER_PATTERNS = [
+    re.compile(pattern) for pattern in (
+        r'oi china\s+(\d{6})\s+([^\n]+?)\s*dept\./subdept\.',
+        r'oi\s+china\s+(\d{6})\s+([^\n]+?)\s*dept\./subdept\.',
+    )
+]
+
+# Cheap keyword checks: every match of the guarded patterns starts at an anchor hit,
+# so a miss skips them entirely and a hit lets them start searching from there
+_SUPPLIER_ANCHOR_RE = re.compile(r'oi\s+china')
+_COMMENT_ANCHOR_RE = re.compile(r'comment\s+for\s+market')
+_STATUS_ANCHOR_RE = re.compile(r'reclamation\s+id')
+
+# Status text right after the claim id, matched on a bounded window of the original text
+_STATUS_TAIL_RE = re.compile(r'\s+([A-Za-z0-9\s\(\)]+?)(?=\s*\n|\s*Style\s+No|\s*Date\s+of\s+delivery)', re.IGNORECASE)
+_STATUS_WINDOW = 200
+
+_OVH_PATTERNS = {
+    # Case-sensitive: otto, delivered, order, style_no, deci_date, date and deci run
+    # against the original text (or the original "Style No." line)
+    'otto': re.compile(r'(\d{7})\s+OTTO'),
+    'incoming': re.compile(r'buyin\s+incoming\s+date\s*[\d/]+\s*([^\n]+?)\s*no\.\s+bowls'),
+    'dept': re.compile(r'dept\.\s*([\d\.]+)'),
+    'cat': re.compile(r'cat\.-no\./page/block\s*([^\n]*?)(\d{8})'),
+    'style_line': re.compile(r'style\s+no\.\s*([^\n]+)'),
+    'style_block': re.compile(r'style\s+no\.\s*\n\s*([^\n]+?)\s*\n\s*inspection result'),
+    'delivered': re.compile(r'([\d,]+)\s+[A-Z]\s+\d+'),
+    'order': re.compile(r'[A-Z]\s+(\d{6})'),
+    'style_no': re.compile(r'\d{6}\s+([^\s]+)'),
+    'pcs_set': re.compile(r'pcs/\s*set\s*(\d+)\s*(\d+)(?:\s*(\d+))?'),
+    'deci_date': re.compile(r'([A-Z])\s*/\s*([A-Z])\s*/\s*[^/]+\s*/\s*(\d{1,2}/\d{1,2}/\d{2})'),
+    'date': re.compile(r'(\d{1,2}/\d{1,2}/\d{2})'),
+    'deci': re.compile(r'([A-Z])\s*/\s*([A-Z])\s*/\s*[^/]+\s*/\s*$'),
+    # The description runs from this heading to the next "Rework" (sliced, not captured)
+    'description': re.compile(r'description\s+of\s+faults\s*'),
+    'description_end': re.compile(r'rework'),
+}
+
+# Placeholders for a field that was not found and a document with no text layer
+NOT_EXTRACTED = "Not extracted"
+NO_TEXT = "Failed to extract text"
+
+_LINE_RE = re.compile(r'[^\n]+')
+_DATE_RE = re.compile(r'(\d+/\d+/\d+)')
+_STATUS_PUNCT_RE = re.compile(r'[\|:\-\*]')
+_TRAILING_NUMBER_RE = re.compile(r'\s+\d+$')
+_DIGITS_RE = re.compile(r'^\d+$')
+
+
+def _lower_for_matching(text):
+    """Lower-case text for the keyword patterns, keeping every offset aligned with text"""
+    lower_text = text.lower()
+    if len(lower_text) == len(text):
+        return lower_text
+    # A few characters (e.g. 'İ') lower-case to two code points; leave those as they are
+    return ''.join(char if len(char.lower()) != 1 else char.lower() for char in text)
+
+
+# Positions of (month, day, year) in the slash-separated parts of each source layout
+_DATE_LAYOUTS = {"dmy": (1, 0, 2), "mdy": (0, 1, 2)}
+
+
+@lru_cache(maxsize=1024)
+def _convert_date(date_str, source_format):
+    """Reorder a D/M/Y or M/D/Y date string to MM/DD/YY (memoized: a batch shares few dates)"""
+    date_str = date_str.strip()
+    parts = date_str.split('/')
+    layout = _DATE_LAYOUTS.get(source_format)
+    if layout is None or len(parts) != 3:
+        return date_str
+
+    month, day, year = (parts[index] for index in layout)
+    return f"{month}/{day}/{year[-2:]}"
+
+class PDFTextExtractor:
+    """Extract PDF text using pdfplumber
+
+    Fields are located by keyword regexes over the page text rather than by word
+    coordinates: BPH and OVH reports wrap labels and values differently between
+    layouts, so position-based lookups would tie extraction to one template.
+    """
+    
+    def extract_text_from_pdf(self, pdf_path):
+        """Reliably extract text (pdf_path may be a path, raw PDF bytes or a binary file-like object)"""
+        text = self.extract_text_with_pdfplumber(pdf_path)
+
+        if not text.strip():
+            return NO_TEXT
+
+        return text
+
+    def extract_text_with_pdfplumber(self, pdf_path):
+        """Extract text with pdfplumber"""
+        page_texts = []
+        if isinstance(pdf_path, (bytes, bytearray)):
+            pdf_path = io.BytesIO(pdf_path)
+        try:
+            with pdfplumber.open(pdf_path) as pdf:
+                for page in pdf.pages:
+                    page_text = page.extract_text()
+                    # Drop the page's parsed chars/layout now rather than holding every
+                    # page's objects until the whole document is closed
+                    page.close()
+                    if page_text:
+                        page_texts.append(page_text)
+
+            # Join once instead of growing the string page by page
+            return "\n".join(page_texts) + "\n" if page_texts else ""
+
+        except Exception as e:
+            logger.error(f"Failed to extract PDF text: {str(e)}")
+            return ""
+
+class DataMapper:
+    """Data mapper - Convert first table to second table"""
+    
+    def __init__(self):
+        self.target_columns = [
+            "Picture", "Production Type", "Claim Type", "Vendor", "Claim No.", 
+            "Claim Date", "Inspection Date", "Customer", "Dept.", "FID", 
+            "TEAM", "QC Trip Leader", "Style NO.", "Order No.", "Article No.", 
+            "Relevant shipped Qty", "Quality Digit (Market)", "Defect Code", 
+            "Claim Reason", "QC Responsibility", "Claim Status", "Validate Month", 
+            "Claim shipped Qty", "Random check in customer warehouse", "Re-check in warehouse"
+        ]
+        # Target field -> source field, copied after clean_value
+        self.field_mappings = {
+            "Vendor": "Supplier Name",
+            "Claim No.": "Claim no", 
+            "Customer": "customer_name",
+            "Dept.": "Dept.",
+            "Style NO.": "Style No",
+            "Order No.": "Order No",
+            "Article No.": "Item No",
+            "Relevant shipped Qty": "Delivered quantity",
+            "Claim Reason": "Description of faults",
+            "Claim Date": "Date of decision"
+        }
+    
+    def map_to_target_format(self, source_df):
+        """Map source data to target format (column-wise, no per-row loop)"""
+        if source_df.empty:
+            return pd.DataFrame(columns=self.target_columns)
+        
+        source_df = source_df.reset_index(drop=True)
+        
+        # Clean every source column the rules read in one pass: the values are
+        # factorized together, each distinct value is cleaned once and broadcast back
+        # by code. Missing values (including columns absent from source_df, which
+        # reindex fills with NaN) get code -1, which picks the trailing "" entry
+        source_fields = list(self.field_mappings.values()) + ["Decision", "Faulty pcs", "Random quantity"]
+        values = source_df.reindex(columns=source_fields).to_numpy(dtype=object)
+        codes, uniques = pd.factorize(values.ravel())
+        cleaned_uniques = np.array([self.clean_value(value) for value in uniques] + [""], dtype=object)
+        cleaned = dict(zip(source_fields, cleaned_uniques[codes].reshape(values.shape).T))
+        
+        # Collect every target column first and build the frame once, in target order;
+        # columns without a mapping rule stay as the "" scalar and are broadcast
+        columns = dict.fromkeys(self.target_columns, "")
+        
+        # 1. Claim Type logic (based on VBA code logic)
+        columns["Claim Type"] = np.where(np.isin(cleaned["Decision"], ["QD45 (Q)", "Q"]), "Complaint", "Claim")
+        
+        # 2. Claim Status fixed as Failure
+        columns["Claim Status"] = "Failure"
+        
+        # 3. Basic field mapping
+        for target_field, source_field in self.field_mappings.items():
+            columns[target_field] = cleaned[source_field]
+        
+        # 4. Combined field: Random check in customer warehouse (only when both values exist)
+        faulty_pcs = cleaned["Faulty pcs"]
+        random_qty = cleaned["Random quantity"]
+        combined = np.where((faulty_pcs != "") & (random_qty != ""), faulty_pcs + "/" + random_qty, "")
+        
+        # Ensure Random check in customer warehouse field is text format
+        columns["Random check in customer warehouse"] = combined.astype(str)
+        
+        return pd.DataFrame(columns, index=source_df.index, columns=self.target_columns)
+    
+    @staticmethod
+    def clean_value(value):
+        """Normalize one cell: 'Not extracted', NaN and blank values become empty strings"""
+        # Cheapest checks first: extracted fields are almost always plain strings
+        if isinstance(value, str):
+            return "" if NOT_EXTRACTED in value else value.strip()
+        if value is None or (isinstance(value, float) and value != value):
+            return ""
+        
+        text = str(value)
+        if NOT_EXTRACTED in text or pd.isna(value) or text.strip() == "":
+            return ""
+        return text.strip()
+
+class UnifiedPDFProcessor:
+    """Unified PDF processor"""
+    
+    def __init__(self):
+        self.required_fields = [
+            'Claim no', 'Decision', 'Style No', 'Item No', 
+            'Delivered quantity', 'Supplier Name', 'Dept.',
+            'Order No', 'Random quantity', 'Faulty pcs', 
+            'Date of decision', 'Description of faults', 'customer_name'
+        ]
+        # Column order of the source table as displayed and downloaded
+        self.source_columns = ['Source File', 'customer_name'] + [
+            field for field in self.required_fields if field != 'customer_name'
+        ]
+        self.pdf_extractor = PDFTextExtractor()
+        self.data_mapper = DataMapper()
+
+    @staticmethod
+    def determine_doc_type(filename):
+        """Determine document type based on filename (RDR* is BPH, CR* is OVH)"""
+        # Only the prefix matters, so avoid upper-casing the whole name
+        filename_prefix = filename[:3].upper()
+        if filename_prefix.startswith('RDR'):
+            return "BPH"
+        elif filename_prefix.startswith('CR'):
+            return "OVH"
+        else:
+            return "UNKNOWN"
+
+    def convert_date_format(self, date_str, source_format="dmy"):
+        """Convert date format to MM/DD/YY"""
+        if date_str == NOT_EXTRACTED or not date_str:
+            return date_str
+        
+        try:
+            return _convert_date(date_str, source_format)
+        except Exception as e:
+            logger.warning(f"Date format conversion failed: {date_str}, error: {str(e)}")
+            return date_str
+
+    def extract_bph_data(self, text, pdf_path):
+        """Extract data from BPH PDF"""
+        data = {field: NOT_EXTRACTED for field in self.required_fields}
+        data['customer_name'] = "BPH"
+
+        try:
+            lower_text = _lower_for_matching(text)
+
+            # Claim no (original Reclamation ID)
+            claim_match = _BPH_PATTERNS['claim'].search(lower_text)
+            if not claim_match:
+                claim_match = _BPH_PATTERNS['claim_report'].search(lower_text)
+            if claim_match:
+                data['Claim no'] = claim_match.group(1)
+
+            # Style No
+            style_match = _BPH_PATTERNS['style'].search(lower_text)
+            if not style_match:
+                style_match = _BPH_PATTERNS['style_item'].search(lower_text)
+                if style_match:
+                    data['Style No'] = style_match.group(1)
+            elif style_match:
+                data['Style No'] = style_match.group(1)
+
+            # Item No
+            item_match = _BPH_PATTERNS['item'].search(lower_text)
+            if not item_match and style_match and len(style_match.groups()) > 1:
+                data['Item No'] = style_match.group(2)
+            elif item_match:
+                data['Item No'] = item_match.group(1)
+
+            # Delivered quantity
+            quantity_match = _BPH_PATTERNS['quantity'].search(lower_text)
+            if not quantity_match:
+                quantity_match = _BPH_PATTERNS['quantity_office'].search(lower_text)
+
+            if quantity_match:
+                quantity = quantity_match.group(1)
+                if len(quantity) == 6:
+                    data['Delivered quantity'] = NOT_EXTRACTED
+                else:
+                    data['Delivered quantity'] = quantity
+
+            # Supplier Name
+            supplier_name = NOT_EXTRACTED
+            supplier_anchor = _SUPPLIER_ANCHOR_RE.search(lower_text)
+            if supplier_anchor:
+                for pattern in _SUPPLIER_PATTERNS:
+                    supplier_match = pattern.search(lower_text, supplier_anchor.start())
+                    if supplier_match:
+                        # split()/join trims and collapses every whitespace run in one pass
+                        supplier_name = " ".join(text[supplier_match.start(2):supplier_match.end(2)].split())
+                        break
+
+            data['Supplier Name'] = supplier_name
+
+            # Dept.
+            dept_match = _BPH_PATTERNS['dept'].search(lower_text)
+            if not dept_match:
+                dept_match = _BPH_PATTERNS['dept_order'].search(lower_text)
+                if dept_match:
+                    data['Dept.'] = dept_match.group(1)
+            elif dept_match:
+                data['Dept.'] = dept_match.group(1)
+
+            # Order No (extracted as string, preserve leading zeros)
+            order_match = _BPH_PATTERNS['order'].search(lower_text)
+            if not order_match and dept_match and len(dept_match.groups()) > 1:
+                data['Order No'] = dept_match.group(2)
+            elif order_match:
+                data['Order No'] = order_match.group(1)
+
+            # Random quantity and Faulty pcs
+            sample_faulty_match = _BPH_PATTERNS['sample_faulty'].search(text)
+            if sample_faulty_match:
+                data['Random quantity'] = sample_faulty_match.group(1)
+                data['Faulty pcs'] = sample_faulty_match.group(2)
+
+            # Date of decision
+            decision_table_match = _BPH_PATTERNS['decision_table'].search(lower_text)
+            if decision_table_match:
+                table_start = decision_table_match.end()
+                next_line_match = _LINE_RE.search(text, table_start)
+                if next_line_match:
+                    data_line = next_line_match.group(0)
+                    date_match = _DATE_RE.search(data_line)
+                    if date_match:
+                        data['Date of decision'] = self.convert_date_format(date_match.group(1), "mdy")
+
+            if data['Date of decision'] == NOT_EXTRACTED:
+                date_decision_match = _BPH_PATTERNS['date_of_decision'].search(lower_text)
+                if date_decision_match:
+                    data['Date of decision'] = self.convert_date_format(date_decision_match.group(1), "mdy")
+
+            # Description of faults
+            comment_anchor = _COMMENT_ANCHOR_RE.search(lower_text)
+            if comment_anchor:
+                # The rest of the heading line is skipped; the comment ends at the first
+                # following section heading, or runs to the end of the text
+                comment_start = text.find('\n', comment_anchor.end())
+                if comment_start < 0:
+                    comment_start = len(text)
+                comment_end_match = _BPH_PATTERNS['comment_end'].search(lower_text, comment_start)
+                comment_end = comment_end_match.start() if comment_end_match else len(text)
+                data['Description of faults'] = " ".join(text[comment_start:comment_end].split())
+
+            # Decision (original Status)
+            if data['Claim no'] != NOT_EXTRACTED:
+                claim_id = data['Claim no']
+                # Status follows the first occurrence of the claim id after "Reclamation ID"
+                # that is followed by a status phrase; only a bounded window is matched
+                status_match3 = None
+                status_anchor = _STATUS_ANCHOR_RE.search(lower_text)
+                id_pos = text.find(claim_id, status_anchor.end()) if status_anchor else -1
+                while id_pos >= 0:
+                    id_end = id_pos + len(claim_id)
+                    status_match3 = _STATUS_TAIL_RE.match(text, id_end, id_end + _STATUS_WINDOW)
+                    if status_match3:
+                        break
+                    id_pos = text.find(claim_id, id_pos + 1)
+
+                if status_match3:
+                    status_text = status_match3.group(1).strip()
+                    status_text = _STATUS_PUNCT_RE.sub('', status_text)
+                    status_text = " ".join(status_text.split())
+                    status_text = _TRAILING_NUMBER_RE.sub('', status_text)
+
+                    if status_text and not _DIGITS_RE.match(status_text):
+                        data['Decision'] = status_text
+
+            logger.info(f"Processed BPH document: {pdf_path}")
+
+        except Exception as e:
+            logger.error(f"Error processing BPH document {pdf_path}: {str(e)}")
+
+        return data
+
+    def extract_ovh_data(self, text, pdf_path):
+        """Extract data from OVH PDF"""
+        data = {field: NOT_EXTRACTED for field in self.required_fields}
+        data['customer_name'] = "OVH"
+        
+        try:
+            lower_text = _lower_for_matching(text)
+
+            # 1. Claim no - 7-digit number before OTTO
+            otto_match = _OVH_PATTERNS['otto'].search(text)
+            if otto_match:
+                data['Claim no'] = otto_match.group(1)
+            
+            # 2. Supplier Name
+            incoming_match = _OVH_PATTERNS['incoming'].search(lower_text)
+            if incoming_match:
+                supplier_text = " ".join(text[incoming_match.start(1):incoming_match.end(1)].split())
+                data['Supplier Name'] = supplier_text
+            
+            # 3. Dept.
+            dept_match = _OVH_PATTERNS['dept'].search(lower_text)
+            if dept_match:
+                data['Dept.'] = dept_match.group(1)
+            
+            # 4. Item No
+            cat_match = _OVH_PATTERNS['cat'].search(lower_text)
+            if cat_match:
+                data['Item No'] = cat_match.group(2)
+            
+            # The "Style No." line is matched once and shared by steps 5-7
+            style_line_match = _OVH_PATTERNS['style_line'].search(lower_text)
+            style_line = text[style_line_match.start(1):style_line_match.end(1)] if style_line_match else None
+
+            # 5. Delivered quantity
+            if style_line:
+                delivered_match = _OVH_PATTERNS['delivered'].search(style_line)
+                if delivered_match:
+                    delivered_str = delivered_match.group(1).replace(',', '')
+                    data['Delivered quantity'] = delivered_str
+            
+            # 6. Order No (extracted as string, preserve leading zeros)
+            if style_line:
+                order_match = _OVH_PATTERNS['order'].search(style_line)
+                if order_match:
+                    data['Order No'] = order_match.group(1)
+
+            # 7. Style No (the multi-line layout can only start where a "Style No." line does)
+            style_block_match = style_line_match and _OVH_PATTERNS['style_block'].search(lower_text, style_line_match.start())
+            if style_block_match:
+                fields = text[style_block_match.start(1):style_block_match.end(1)].split()
+                if fields:
+                    data['Style No'] = fields[-1]
+            elif style_line:
+                style_match = _OVH_PATTERNS['style_no'].search(style_line)
+                if style_match:
+                    data['Style No'] = style_match.group(1)
+                else:
+                    fields = style_line.split()
+                    if fields:
+                        data['Style No'] = fields[-1]
+
+            # 8. Random quantity and Faulty pcs
+            pcs_set_match = _OVH_PATTERNS['pcs_set'].search(lower_text)
+            if pcs_set_match:
+                if pcs_set_match.group(3):
+                    num1 = int(pcs_set_match.group(1))
+                    num2 = int(pcs_set_match.group(2))
+                    data['Random quantity'] = str(num1 + num2)
+                    data['Faulty pcs'] = pcs_set_match.group(3)
+                else:
+                    data['Random quantity'] = pcs_set_match.group(1)
+                    data['Faulty pcs'] = pcs_set_match.group(2)
+            
+            # 9. Decision (original Deci.) and Date of decision
+            deci_date_match = _OVH_PATTERNS['deci_date'].search(text)
+            
+            if deci_date_match:
+                data['Decision'] = deci_date_match.group(2)
+                data['Date of decision'] = self.convert_date_format(deci_date_match.group(3), "dmy")
+            else:
+                date_match = _OVH_PATTERNS['date'].search(text)
+                if date_match:
+                    before_date = text[:date_match.start()]
+                    deci_match = _OVH_PATTERNS['deci'].search(before_date)
+                    if deci_match:
+                        data['Decision'] = deci_match.group(2)
+                        data['Date of decision'] = self.convert_date_format(date_match.group(1), "dmy")
+            
+            # 10. Description of faults (no translation, keep original text)
+            description_match = _OVH_PATTERNS['description'].search(lower_text)
+            description_end_match = description_match and _OVH_PATTERNS['description_end'].search(lower_text, description_match.end())
+            if description_end_match:
+                original_description = text[description_match.end():description_end_match.start()]
+                # split()/join also covers line breaks, their indentation and the outer whitespace
+                cleaned_description = " ".join(original_description.split())
+                data['Description of faults'] = cleaned_description
+            
+            logger.info(f"Processed OVH document: {pdf_path}")
+            return data
+            
+        except Exception as e:
+            logger.error(f"Error processing OVH document {pdf_path}: {str(e)}")
+            return data
+
+    def extract_data_from_pdf(self, pdf_path, filename):
+        """Extract data from PDF (path, bytes or binary file-like object), automatically determine document type"""
+        text = self.pdf_extractor.extract_text_from_pdf(pdf_path)
+
+        if text == NO_TEXT:
+            logger.warning(f"Failed to extract text from {filename}")
+            data = {field: NO_TEXT for field in self.required_fields}
+            data['customer_name'] = "Unknown"
+            return data
+
+        doc_type = self.determine_doc_type(filename)
+        
+        if doc_type == "BPH":
+            return self.extract_bph_data(text, filename)
+        elif doc_type == "OVH":
+            return self.extract_ovh_data(text, filename)
+        else:
+            if "Reclamation ID" in text:
+                return self.extract_bph_data(text, filename)
+            elif "OTTO" in text and "Control" in text:
+                return self.extract_ovh_data(text, filename)
+            else:
+                logger.warning(f"Unable to determine document type, using BPH as default: {filename}")
+                return self.extract_bph_data(text, filename)
+
+
+def process_one_pdf(pdf_bytes, filename):
+    """Extract data from one uploaded PDF (module level so worker processes can pickle it)"""
+    processor = UnifiedPDFProcessor()
+
+    # pdfplumber reads the PDF from memory, so no temp file round-trip is needed
+    data = processor.extract_data_from_pdf(pdf_bytes, filename)
+    data['Source File'] = filename
+    return data
+